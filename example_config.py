@@ -41,8 +41,9 @@ def single_check():
         'https://www.example.com',
     ]
     
-    monitor = UptimeMonitor(urls=urls)
-    monitor.start_monitoring(continuous=False)
+    # The with block closes the monitor (connections, log file) when done
+    with UptimeMonitor(urls=urls) as monitor:
+        monitor.start_monitoring(continuous=False)
 
 
 # Example 4: Production monitoring with multiple sites
@@ -60,7 +61,8 @@ def production_monitoring():
     monitor = UptimeMonitor(
         urls=urls,
         timeout=15,          # 15 second timeout for slower sites
-        check_interval=120   # Check every 2 minutes
+        check_interval=120,  # Check every 2 minutes
+        max_workers=5        # Check up to 5 sites at the same time
     )
     monitor.start_monitoring(continuous=True)
 
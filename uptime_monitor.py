@@ -5,19 +5,120 @@ A simple yet production-useful tool to monitor website availability and performa
 """
 
 import requests
-import csv
-import smtplib
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.util.connection import allowed_gai_family
+import atexit
+import socket
+import sys
+import threading
 import time
 from datetime import datetime
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 import os
+import queue
+import signal
+from string import Template
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+
+DNS_CACHE_TTL = 15 * 60  # Re-resolve cached hostnames every 15 minutes
+DNS_CACHE_SIZE = 1024
+MAX_DRAIN_BYTES = 64 * 1024  # Largest fallback GET body worth reading to keep the connection
+ALERT_QUEUE_SIZE = 100  # Pending email alerts before new ones are deferred to the next cycle
+
+ALERT_BODY = Template("""
+Website Downtime Alert
+
+URL: $url
+Status: $status
+Status Code: $status_code
+Response Time: ${response_time}ms
+Timestamp: $timestamp
+
+This is an automated alert from your uptime monitor.
+""")
+
+CSV_HEADER = 'Timestamp,URL,Status,Response Time (ms),Status Code\r\n'
+CSV_SPECIAL_CHARS = (',', '"', '\r', '\n')
+
+_dns_cache = {}
+_dns_cache_lock = threading.Lock()
+_original_getaddrinfo = socket.getaddrinfo
+_dns_cache_users = 0  # Open monitors relying on the getaddrinfo patch
+
+
+def _cached_getaddrinfo(*args, **kwargs):
+    """socket.getaddrinfo wrapper that remembers successful lookups for DNS_CACHE_TTL."""
+    key = (args, tuple(sorted(kwargs.items())))
+    now = time.monotonic()
+    
+    with _dns_cache_lock:
+        cached = _dns_cache.get(key)
+    if cached and now - cached[0] < DNS_CACHE_TTL:
+        return cached[1]
+    
+    # Failures raise and are never cached, so a broken host is retried next time
+    result = _original_getaddrinfo(*args, **kwargs)
+    with _dns_cache_lock:
+        if len(_dns_cache) >= DNS_CACHE_SIZE:
+            _dns_cache.clear()
+        _dns_cache[key] = (now, result)
+    return result
+
+
+def _url_origin(url):
+    """Return a URL's (scheme, netloc), or the raw URL if it can't be parsed."""
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return ('', url)
+    return (parsed.scheme, parsed.netloc)
+
+
+def _csv_field(value):
+    """Format a value as a CSV field, quoting it only when it needs it."""
+    text = str(value)
+    if any(char in text for char in CSV_SPECIAL_CHARS):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _enable_dns_cache():
+    """Route hostname lookups through the shared DNS cache."""
+    global _dns_cache_users
+    with _dns_cache_lock:
+        _dns_cache_users += 1
+        socket.getaddrinfo = _cached_getaddrinfo
+
+
+def _disable_dns_cache():
+    """Restore the original socket.getaddrinfo once no monitor needs the cache."""
+    global _dns_cache_users
+    with _dns_cache_lock:
+        _dns_cache_users -= 1
+        if _dns_cache_users == 0:
+            socket.getaddrinfo = _original_getaddrinfo
+            _dns_cache.clear()
+
+
+@dataclass
+class CheckResult:
+    """Outcome of a single website check."""
+    
+    __slots__ = ('timestamp', 'url', 'status', 'response_time', 'status_code')
+    
+    timestamp: str
+    url: str
+    status: str
+    response_time: float
+    status_code: object  # HTTP status code, or 'TIMEOUT' / 'ERROR: ...'
 
 
 class UptimeMonitor:
     """Monitor website uptime and performance."""
     
-    def __init__(self, urls, timeout=10, check_interval=60):
+    def __init__(self, urls, timeout=10, check_interval=60, max_workers=None):
         """
         Initialize the uptime monitor.
         
@@ -25,12 +126,50 @@ class UptimeMonitor:
             urls (list): List of URLs to monitor
             timeout (int): Request timeout in seconds (default: 10)
             check_interval (int): Time between checks in seconds (default: 60)
+            max_workers (int): Maximum concurrent checks (default: one per URL, up to 32)
         """
-        self.urls = urls
+        # Drop duplicate URLs (ignoring a trailing slash when comparing) while keeping
+        # their order; the first spelling of each URL is the one that gets checked
+        unique_urls = {}
+        for url in urls:
+            try:
+                key = urlparse(url).geturl().rstrip('/')
+            except ValueError:
+                # Malformed URLs are kept as-is and reported as errors by check_website
+                key = url
+            unique_urls.setdefault(key, url)
+        self.urls = list(unique_urls.values())
         self.timeout = timeout
         self.check_interval = check_interval
         self.csv_file = 'uptime_log.csv'
         self.down_sites = {}  # Track which sites are down to avoid spam
+        self._stop_event = threading.Event()  # Set to end continuous monitoring
+        
+        # Status prefixes are built once; skip the colors when output is redirected
+        if sys.stdout.isatty():
+            self._up_prefix = '\033[92m✓\033[0m'
+            self._down_prefix = '\033[91m✗\033[0m'
+        else:
+            self._up_prefix = '✓'
+            self._down_prefix = '✗'
+        
+        # Checks are network-bound, so run them concurrently; reused across cycles
+        if max_workers is None:
+            max_workers = min(32, len(self.urls))
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        
+        # Shared session keeps connections alive between checks and cycles. urllib3
+        # keeps one pool per (scheme, host, port) and redirect targets need pools
+        # too, so leave headroom for them - evicted pools lose their warm connections.
+        # Several hosts may redirect to one canonical host, so every pool can hold a
+        # connection per worker; idle keep-alive sockets are cheap
+        origins = {_url_origin(url) for url in self.urls}
+        pool_connections = max(DEFAULT_POOLSIZE, 2 * len(origins))
+        pool_maxsize = max(1, max_workers)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         
         # Email configuration (set these via environment variables or modify directly)
         self.email_enabled = False
@@ -43,149 +182,351 @@ class UptimeMonitor:
         # Enable email if credentials are provided
         if self.sender_email and self.sender_password and self.recipient_email:
             self.email_enabled = True
+        self._smtp = None  # Authenticated SMTP connection, opened on the first alert
+        
+        # Alerts are sent from a background thread so a slow mail server never
+        # holds up the check cycle
+        self._alert_q = queue.Queue(maxsize=ALERT_QUEUE_SIZE)
+        # The worker reports (url, error) back here; only the checking thread
+        # updates down_sites and _pending_alerts or prints alert outcomes
+        self._alert_outcomes = queue.Queue()
+        self._pending_alerts = set()
+        self._alert_thread = None
+        if self.email_enabled:
+            # Email modules are only imported when alerts are enabled
+            from email.message import EmailMessage
+            
+            # Only Subject and body change between alerts, so build the rest once
+            self._alert_msg = EmailMessage()
+            self._alert_msg['From'] = self.sender_email
+            self._alert_msg['To'] = self.recipient_email
+            self._alert_thread = threading.Thread(target=self._alert_worker, daemon=True)
+            self._alert_thread.start()
         
         self._initialize_csv()
+        
+        # The monitored hosts never change, so cache their DNS lookups and
+        # resolve them up front instead of during the first cycle. Done last so a
+        # failing constructor never leaves socket.getaddrinfo patched
+        _enable_dns_cache()
+        self._dns_cache_enabled = True
+        self._resolve_hosts()
+        
+        # Safety net for monitors that are never closed explicitly
+        atexit.register(self.close)
+    
+    def _resolve_hosts(self):
+        """Warm the DNS cache for every monitored host."""
+        for url in self.urls:
+            try:
+                parsed = urlparse(url)
+                if not parsed.hostname:
+                    continue
+                port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+                # Same arguments urllib3 uses, so its lookups hit these cache entries
+                socket.getaddrinfo(parsed.hostname, port, allowed_gai_family(), socket.SOCK_STREAM)
+            except (OSError, ValueError):
+                # Malformed or unresolvable URLs are reported as errors by check_website
+                pass
     
     def _initialize_csv(self):
-        """Create CSV file with headers if it doesn't exist."""
-        if not os.path.exists(self.csv_file):
-            with open(self.csv_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Timestamp', 'URL', 'Status', 'Response Time (ms)', 'Status Code'])
+        """Open the CSV log for appending, writing headers if it doesn't exist."""
+        is_new = not os.path.exists(self.csv_file)
+        
+        # Keep one buffered handle open for the monitor's lifetime; it is flushed
+        # once per cycle so the log on disk stays current
+        self._csv_fh = open(self.csv_file, 'ab')
+        
+        # URLs never change, so escape them for CSV once up front
+        self._csv_urls = {url: _csv_field(url) for url in self.urls}
+        
+        if is_new:
+            self._csv_fh.write(CSV_HEADER.encode('utf-8'))
+            self._csv_fh.flush()
             print(f"✓ Created log file: {self.csv_file}")
 
-    def check_website(self, url):
+    def check_website(self, url, timestamp=None):
         """
         Check a single website's uptime and performance.
         
         Args:
             url (str): The URL to check
+            timestamp (str): Cycle timestamp to record (default: current time)
             
         Returns:
-            dict: Status information including response time and status code
+            CheckResult: Status information including response time and status code
         """
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        if timestamp is None:
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         try:
-            start_time = time.time()
-            response = requests.get(url, timeout=self.timeout)
-            response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+            start_time = time.monotonic()
+            # HEAD is enough to learn the status code without downloading the page
+            with self.session.head(url, timeout=self.timeout, allow_redirects=True) as response:
+                status_code = response.status_code
+            if status_code in (405, 501):
+                status_code = self._get_status_code(url)
+            response_time = (time.monotonic() - start_time) * 1000  # Convert to milliseconds
             
-            status = 'UP' if response.status_code == 200 else 'DOWN'
-            status_code = response.status_code
+            # Treat any success or redirect as UP
+            status = 'UP' if 200 <= status_code < 400 else 'DOWN'
             
-            return {
-                'timestamp': timestamp,
-                'url': url,
-                'status': status,
-                'response_time': round(response_time, 2),
-                'status_code': status_code
-            }
+            # Keep full precision; it's rounded only when displayed or logged
+            return CheckResult(timestamp, url, status, response_time, status_code)
             
         except requests.exceptions.Timeout:
-            return {
-                'timestamp': timestamp,
-                'url': url,
-                'status': 'DOWN',
-                'response_time': self.timeout * 1000,
-                'status_code': 'TIMEOUT'
-            }
+            return CheckResult(timestamp, url, 'DOWN', self.timeout * 1000, 'TIMEOUT')
         except requests.exceptions.RequestException as e:
-            return {
-                'timestamp': timestamp,
-                'url': url,
-                'status': 'DOWN',
-                'response_time': 0,
-                'status_code': f'ERROR: {str(e)[:50]}'
-            }
+            return CheckResult(timestamp, url, 'DOWN', 0, f'ERROR: {str(e)[:50]}')
+    
+    def _get_status_code(self, url):
+        """
+        Fetch a URL's status code with GET, for servers that don't support HEAD.
+        
+        The body is streamed rather than downloaded. Small bodies are drained so the
+        keep-alive connection can go back to the pool; larger ones are abandoned.
+        
+        Args:
+            url (str): The URL to check
+            
+        Returns:
+            int: The HTTP status code
+        """
+        with self.session.get(url, timeout=self.timeout, stream=True,
+                              allow_redirects=True) as response:
+            content_length = response.headers.get('Content-Length', '')
+            if content_length.isdigit() and int(content_length) <= MAX_DRAIN_BYTES:
+                for _ in response.iter_content(chunk_size=MAX_DRAIN_BYTES):
+                    pass
+            return response.status_code
     
     def log_to_console(self, result):
         """Print status to console with color coding."""
-        status_symbol = '✓' if result['status'] == 'UP' else '✗'
-        status_color = '\033[92m' if result['status'] == 'UP' else '\033[91m'
-        reset_color = '\033[0m'
-        
-        print(f"{status_color}{status_symbol}{reset_color} [{result['timestamp']}] "
-              f"{result['url']} - {result['status']} - "
-              f"{result['response_time']}ms - Code: {result['status_code']}")
-    
-    def log_to_csv(self, result):
-        """Append result to CSV log file."""
-        with open(self.csv_file, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                result['timestamp'],
-                result['url'],
-                result['status'],
-                result['response_time'],
-                result['status_code']
-            ])
+        prefix = self._up_prefix if result.status == 'UP' else self._down_prefix
+        print(prefix, ' [', result.timestamp, '] ', result.url, ' - ', result.status,
+              ' - ', f'{result.response_time:.2f}', 'ms - Code: ', result.status_code, sep='')
+    
+    def log_to_csv(self, results):
+        """
+        Append a batch of results to the CSV log file.
+        
+        Args:
+            results (list): Check results from a single cycle
+        """
+        lines = []
+        for result in results:
+            url = self._csv_urls.get(result.url) or _csv_field(result.url)
+            # Numeric status codes never need quoting; error messages might
+            status_code = result.status_code
+            if not isinstance(status_code, int):
+                status_code = _csv_field(status_code)
+            lines.append(f"{result.timestamp},{url},{result.status},"
+                         f"{result.response_time:.2f},{status_code}\r\n")
+        
+        # Rows use the same \r\n terminator the csv module wrote, so older logs stay consistent
+        self._csv_fh.write(''.join(lines).encode('utf-8'))
+        self._csv_fh.flush()
 
     def send_email_alert(self, result):
         """
-        Send email alert when a website is down.
+        Queue an email alert when a website goes down.
+        
+        The email itself is sent by the background alert worker.
         
         Args:
-            result (dict): The check result containing status information
+            result (CheckResult): The check result containing status information
         """
         if not self.email_enabled:
             return
         
-        # Only send alert if site just went down (not already down)
-        if result['url'] not in self.down_sites:
+        # Only send alert if site just went down (not already down or being alerted)
+        if (result.status == 'DOWN' and result.url not in self.down_sites
+                and result.url not in self._pending_alerts):
             try:
-                msg = MIMEMultipart()
-                msg['From'] = self.sender_email
-                msg['To'] = self.recipient_email
-                msg['Subject'] = f"🚨 ALERT: {result['url']} is DOWN"
-                
-                body = f"""
-Website Downtime Alert
-
-URL: {result['url']}
-Status: {result['status']}
-Status Code: {result['status_code']}
-Response Time: {result['response_time']}ms
-Timestamp: {result['timestamp']}
-
-This is an automated alert from your uptime monitor.
-                """
-                
-                msg.attach(MIMEText(body, 'plain'))
+                self._alert_q.put_nowait(result)
+                self._pending_alerts.add(result.url)
+            except queue.Full:
+                print(f"  ⚠ Alert queue full, will retry alert for {result.url} next cycle")
+        
+        # Remove from down_sites if it's back up
+        if result.status == 'UP' and result.url in self.down_sites:
+            del self.down_sites[result.url]
+            print(f"  ✓ {result.url} is back UP!")
+    
+    def _process_alert_outcomes(self):
+        """Record and report alerts the worker has finished with since the last cycle."""
+        while True:
+            try:
+                url, error = self._alert_outcomes.get_nowait()
+            except queue.Empty:
+                return
+            self._pending_alerts.discard(url)
+            if error is None:
+                print(f"  📧 Email alert sent for {url}")
+                self.down_sites[url] = True
+            else:
+                # A failed alert is left unmarked so the next cycle retries it
+                print(f"  ⚠ Failed to send email: {error}")
+    
+    def _alert_worker(self):
+        """Send queued email alerts until a None sentinel is received."""
+        while True:
+            result = self._alert_q.get()
+            if result is None:
+                break
+            
+            try:
+                # Only this thread touches the template message, so reuse it in place
+                msg = self._alert_msg
+                del msg['Subject']
+                msg['Subject'] = f"🚨 ALERT: {result.url} is DOWN"
+                msg.set_content(ALERT_BODY.substitute(
+                    url=result.url,
+                    status=result.status,
+                    status_code=result.status_code,
+                    response_time=f'{result.response_time:.2f}',
+                    timestamp=result.timestamp
+                ))
                 
-                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                    server.starttls()
-                    server.login(self.sender_email, self.sender_password)
-                    server.send_message(msg)
+                self._send_message(msg)
                 
-                print(f"  📧 Email alert sent for {result['url']}")
-                self.down_sites[result['url']] = True
+                self._alert_outcomes.put((result.url, None))
                 
             except Exception as e:
-                print(f"  ⚠ Failed to send email: {str(e)}")
+                self._alert_outcomes.put((result.url, str(e)))
         
-        # Remove from down_sites if it's back up
-        if result['status'] == 'UP' and result['url'] in self.down_sites:
-            del self.down_sites[result['url']]
-            print(f"  ✓ {result['url']} is back UP!")
+        self._close_smtp()
+    
+    def _get_smtp(self):
+        """Return a live, logged-in SMTP connection, reconnecting if needed."""
+        import smtplib
+        
+        if self._smtp is not None:
+            try:
+                # Cheap liveness check - servers drop idle sessions between alerts
+                self._smtp.noop()
+                return self._smtp
+            except (smtplib.SMTPException, OSError):
+                self._close_smtp()
+        
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            server.starttls()
+            server.login(self.sender_email, self.sender_password)
+        except Exception:
+            server.close()
+            raise
+        self._smtp = server
+        return server
+    
+    def _send_message(self, msg):
+        """Send an email over the reused SMTP connection."""
+        import smtplib
+        
+        try:
+            self._get_smtp().send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Connection died after the liveness check - reconnect once and retry
+            self._close_smtp()
+            self._get_smtp().send_message(msg)
+    
+    def _close_smtp(self):
+        """Close the SMTP connection if one is open."""
+        if self._smtp is None:
+            return
+        import smtplib
+        
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
     
     def run_check(self):
         """Run a single check cycle for all URLs."""
         print(f"\n{'='*70}")
-        print(f"Starting check cycle at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        # Format the time once per cycle and share it across all results
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        print(f"Starting check cycle at {timestamp}")
         print(f"{'='*70}")
         
-        for url in self.urls:
-            result = self.check_website(url)
+        # Fan out the network checks, then log/alert on this thread so that
+        # CSV writes and the down_sites bookkeeping never race
+        futures = {
+            self._executor.submit(self.check_website, url, timestamp): url
+            for url in self.urls
+        }
+        completed = {}
+        for future in as_completed(futures):
+            completed[futures[future]] = future.result()
+        results = [completed[url] for url in self.urls]
+        
+        # One CSV write per cycle rather than per URL
+        self.log_to_csv(results)
+        
+        self._process_alert_outcomes()
+        for result in results:
             self.log_to_console(result)
-            self.log_to_csv(result)
             
-            if result['status'] == 'DOWN':
+            if result.status == 'DOWN':
                 self.send_email_alert(result)
-            elif result['status'] == 'UP' and result['url'] in self.down_sites:
+            elif result.status == 'UP' and result.url in self.down_sites:
                 # Site recovered
                 self.send_email_alert(result)
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """
+        Release resources held by the monitor.
+        
+        Called automatically at interpreter exit if not called earlier; the
+        monitor can't run checks afterwards.
+        """
+        atexit.unregister(self.close)
+        self._executor.shutdown(wait=False)
+        self.session.close()
+        self._csv_fh.close()
+        if self._dns_cache_enabled:
+            _disable_dns_cache()
+            self._dns_cache_enabled = False
+        
+        # Let the alert worker finish pending alerts, then close its SMTP connection
+        if self._alert_thread is not None:
+            try:
+                self._alert_q.put(None, timeout=30)
+                self._alert_thread.join(timeout=30)
+            except queue.Full:
+                print("  ⚠ Mail server not responding, dropping pending alerts")
+            self._alert_thread = None
+            self._process_alert_outcomes()
+    
+    def stop(self):
+        """Ask continuous monitoring to stop; safe to call from any thread."""
+        self._stop_event.set()
+    
+    def _install_signal_handlers(self):
+        """
+        Make SIGTERM stop the monitor the same way Ctrl+C (SIGINT) does.
+        
+        Both raise KeyboardInterrupt in the main thread. The handler must not
+        take locks (e.g. by setting _stop_event), since the signal may arrive
+        while the main thread holds that lock inside _stop_event.wait().
+        
+        Returns:
+            dict: Previous handlers, to restore when monitoring ends
+        """
+        previous = {}
+        if threading.current_thread() is not threading.main_thread():
+            # Signal handlers can only be installed from the main thread
+            return previous
+        previous[signal.SIGTERM] = signal.signal(signal.SIGTERM, signal.default_int_handler)
+        return previous
+    
     def start_monitoring(self, continuous=True):
         """
         Start the monitoring process.
@@ -208,15 +549,41 @@ This is an automated alert from your uptime monitor.
             print("\n✓ Single check completed")
             return
         
+        # Allow monitoring to be restarted after an earlier stop()
+        self._stop_event.clear()
+        previous_handlers = self._install_signal_handlers()
         try:
-            while True:
+            # Schedule cycles on a fixed cadence so the time spent checking
+            # doesn't push every following cycle later
+            next_deadline = time.monotonic() + self.check_interval
+            while not self._stop_event.is_set():
                 self.run_check()
-                print(f"\n⏳ Next check in {self.check_interval} seconds... (Press Ctrl+C to stop)")
-                time.sleep(self.check_interval)
+                
+                now = time.monotonic()
+                if next_deadline <= now:
+                    if self.check_interval > 0:
+                        # The cycle overran one or more intervals - skip the missed slots
+                        missed = (now - next_deadline) // self.check_interval + 1
+                        next_deadline += missed * self.check_interval
+                    else:
+                        # No interval configured - check again straight away
+                        next_deadline = now
+                sleep_for = next_deadline - now
+                
+                print(f"\n⏳ Next check in {sleep_for:.0f} seconds... (Press Ctrl+C to stop)")
+                # Returns early when stop() is called; Ctrl+C/SIGTERM interrupt it
+                if self._stop_event.wait(sleep_for):
+                    break
+                next_deadline += self.check_interval
         except KeyboardInterrupt:
-            print("\n\n" + "="*70)
-            print("Monitor stopped by user")
-            print("="*70)
+            pass
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+        
+        print("\n\n" + "="*70)
+        print("Monitor stopped by user")
+        print("="*70)
 
 
 